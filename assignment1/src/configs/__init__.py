@@ -1,3 +1,4 @@
 from .config import settings
+from .entities import ENTITY_NAMES_CYPHER
 
-__all__ = ["settings"]
+__all__ = ["settings", "ENTITY_NAMES_CYPHER"]
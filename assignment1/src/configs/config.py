@@ -34,6 +34,23 @@ class Settings(BaseSettings):
 
     APPLICATION_API_PORT: int
 
+    STREAMING_ENTITY_LINKING: bool = False
+
+    REQUEST_TIMEOUT: float = 60.0
+    LLM_TIMEOUT: float = 30.0
+    LLM_RETRIES: int = 1
+    RETRIEVAL_TIMEOUT: float = 10.0
+    RETRIEVAL_RETRIES: int = 2
+    RETRY_BACKOFF: float = 0.5
+    HEDGE_PERCENTILE: Optional[float] = 95.0
+    BREAKER_FAILURE_THRESHOLD: int = 5
+    BREAKER_RESET_TIMEOUT: float = 30.0
+    BLOCKING_POOL_SIZE: int = 8
+
+    FIXTURE_PATH: str = "../assignment2/data/fixtures.json"
+    FIXTURE_SYNC_STATE_PATH: str = "data/fixture_sync_state.json"
+    FIXTURE_SYNC_INTERVAL: int = 0
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
 
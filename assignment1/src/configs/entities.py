@@ -0,0 +1,4 @@
+# names of the nodes which are indexed in the vector store for entity linking
+ENTITY_NAMES_CYPHER = """MATCH (n)
+WHERE n:Route OR n:Stop OR n:Team OR n:Referee OR n:Stadium
+RETURN DISTINCT coalesce(n.name, n.TeamName, n.RefereeName, n.StadiumName) AS name"""
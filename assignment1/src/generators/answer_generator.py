@@ -1,3 +1,5 @@
+from typing import Optional
+
 from langchain.chains.combine_documents.base import BaseCombineDocumentsChain
 from langchain_core.language_models import LLM
 from langchain_core.output_parsers.string import StrOutputParser
@@ -5,12 +7,19 @@ from langchain_core.prompts.prompt import PromptTemplate
 
 from src.loggers import logger
 from src.prompts.answer_generator import ANSWER_GENERATOR_PROMPT
+from src.resilience import ResilientCaller
 from src.schemas import BaseStep, GenerationFlowState
 
 
 class AnswerGenerator(BaseStep):
-    def __init__(self, llm: LLM, prompt: str = ANSWER_GENERATOR_PROMPT):
+    def __init__(
+        self,
+        llm: LLM,
+        prompt: str = ANSWER_GENERATOR_PROMPT,
+        llm_caller: Optional[ResilientCaller] = None,
+    ):
         self.llm = llm
+        self.llm_caller = llm_caller or ResilientCaller("answer_generator")
         self.chain = self._create_single_chain(
             prompt_template=prompt, parser=StrOutputParser()
         )
@@ -54,8 +63,11 @@ class AnswerGenerator(BaseStep):
                 for context in contexts
             ]
             context_str = "\n".join(context_strs)
-            answer = await self.chain.ainvoke(
-                {"question": question, "context": context_str}
+            answer = await self.llm_caller.call(
+                lambda: self.chain.ainvoke(
+                    {"question": question, "context": context_str}
+                ),
+                deadline=state.get("deadline"),
             )
 
         except Exception as e:
@@ -1,6 +1,8 @@
+import asyncio
 import re
+import threading
 from itertools import product
-from typing import Any, Dict, List
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
 
 from langchain_core.documents import Document
 from langchain_core.language_models import LLM
@@ -14,9 +16,16 @@ from neo4j_graphrag.retrievers.text2cypher import extract_cypher
 from neo4j_graphrag.schema import format_schema
 from src.loggers import logger
 from src.prompts.text2cypher import TEXT2CYPHER_PROMPT
+from src.resilience import ResilientCaller
 from src.schemas import BaseStep, GenerationFlowState
 
 
+class SchemaSnapshot(NamedTuple):
+    structured: Dict[str, Any]
+    prompt: str
+    corrector: CypherQueryCorrector
+
+
 class Text2Cypher(BaseStep):
 
     def __init__(
@@ -25,6 +34,10 @@ class Text2Cypher(BaseStep):
         vector_db: VectorStore,
         graph_db: GraphStore,
         prompt: str = TEXT2CYPHER_PROMPT,
+        streaming: bool = False,
+        llm_caller: Optional[ResilientCaller] = None,
+        vector_caller: Optional[ResilientCaller] = None,
+        graph_caller: Optional[ResilientCaller] = None,
         **kwargs: dict,
     ):
         """
@@ -32,12 +45,23 @@ class Text2Cypher(BaseStep):
 
         Args:
             llm (LLM): The language model used for generating cypher queries.
+            streaming (bool): Stream the LLM output and start entity linking and
+                graph warm-up while the cypher is still being generated.
+            llm_caller (Optional[ResilientCaller]): policies for the LLM call.
+            vector_caller (Optional[ResilientCaller]): policies for entity
+                linking; when its circuit is open linking is skipped.
+            graph_caller (Optional[ResilientCaller]): policies for the graph
+                warm-up; skipped while its circuit is open or its pool is full.
             **kwargs (dict): Additional keyword arguments.
         """
         super().__init__(**kwargs)
         self.llm = llm
         self.graph_db = graph_db
         self.prompt = prompt
+        self.streaming = streaming
+        self.llm_caller = llm_caller or ResilientCaller("text2cypher")
+        self.vector_caller = vector_caller or ResilientCaller("entity_linking")
+        self.graph_caller = graph_caller or ResilientCaller("graph_warm_up")
 
         _prompt = PromptTemplate(
             template=self.prompt,
@@ -45,82 +69,185 @@ class Text2Cypher(BaseStep):
         )
         self._chain = _prompt | self.llm | StrOutputParser()
         self.vector_db = vector_db
+        self._schema_lock = threading.Lock()
+        self._schema = self._create_schema_snapshot()
+
+    @property
+    def cypher_query_corrector(self) -> CypherQueryCorrector:
+        return self._schema.corrector
+
+    def invalidate_cache(self, *args: Any) -> None:
+        """Refresh the graph schema after the graph changes
+
+        Safe to call from another thread: requests only read the schema
+        snapshot, which is replaced in a single assignment.
+        """
+        with self._schema_lock:
+            self.graph_db.refresh_schema()
+            self._schema = self._create_schema_snapshot()
 
+    def _create_schema_snapshot(self) -> SchemaSnapshot:
+        structured_schema = self.graph_db.get_structured_schema
         corrector_schema = [
             Schema(el["start"], el["type"], el["end"])
-            for el in self.graph_db.get_structured_schema.get("relationships", [])
+            for el in structured_schema.get("relationships", [])
         ]
-        self.cypher_query_corrector = CypherQueryCorrector(corrector_schema)
+        return SchemaSnapshot(
+            structured=structured_schema,
+            prompt=construct_schema(
+                structured_schema, [], [], self.graph_db._enhanced_schema
+            ),
+            corrector=CypherQueryCorrector(corrector_schema),
+        )
 
     async def arun(self, state: GenerationFlowState) -> GenerationFlowState:
         errors = state.get("errors", [])
         question = state.get("question", None)
+        deadline = state.get("deadline", None)
         if len(errors) > 0:
             return state
 
         cypher_query = ""
+        linking_tasks: Dict[str, asyncio.Task] = {}
+        warmup_tasks: Set[asyncio.Task] = set()
         try:
-            cypher_query = await self._generate_cypher_query(question)
+            if self.streaming:
+                cypher_query, linking_tasks = await self.llm_caller.call(
+                    lambda: self._generate_cypher_query_streaming(
+                        question, deadline, warmup_tasks
+                    ),
+                    deadline=deadline,
+                )
+            else:
+                cypher_query = await self.llm_caller.call(
+                    lambda: self._generate_cypher_query(question),
+                    deadline=deadline,
+                )
         except Exception as e:
             logger.exception(f"Can not generate cypher because of {e}")
             errors.append(e)
             state["errors"] = errors
 
         if not cypher_query or errors:
+            self._cancel_tasks(linking_tasks.values())
+            self._cancel_tasks(warmup_tasks)
             return state
 
         try:
-            cypher_queries = await self._map_entities(cypher_query)
-            contexts = [
-                Document(
-                    page_content="",
-                    metadata={
-                        "cypher": cypher_augmented_query["cypher"],
-                        "score": cypher_augmented_query["score"],
-                    },
-                )
-                for cypher_augmented_query in cypher_queries
-                if cypher_augmented_query
-            ]
-            state["contexts"] = contexts
-
+            cypher_queries = await self._map_entities(
+                cypher_query, linking_tasks, deadline
+            )
         except Exception as err:
-            logger.exception(
-                f"Can not find similar entity in cypher code because of {err}"
+            # degrade to the generated cypher rather than failing the request
+            self._cancel_tasks(linking_tasks.values())
+            logger.warning(
+                f"Skip entity linking because of {err!r}, use the generated cypher"
             )
-            errors.append(f"Cannot link entities because of {err}")
-            state["errors"] = errors
+            cypher_queries = [{"cypher": cypher_query, "score": 1.0}]
+
+        # the real query runs next, pending warm-ups would only compete with it
+        self._cancel_tasks(warmup_tasks)
+
+        contexts = [
+            Document(
+                page_content="",
+                metadata={
+                    "cypher": cypher_augmented_query["cypher"],
+                    "score": cypher_augmented_query["score"],
+                },
+            )
+            for cypher_augmented_query in cypher_queries
+            if cypher_augmented_query
+        ]
+        state["contexts"] = contexts
 
         return state
 
     async def _generate_cypher_query(self, question: str) -> str:
         logger.info("Text2Cypher")
-        graph_schema = construct_schema(
-            self.graph_db.get_structured_schema,
-            [],
-            [],
-            self.graph_db._enhanced_schema,
-        )
         cypher_query = await self._chain.ainvoke(
-            {"question": question, "schema": graph_schema}
+            {"question": question, "schema": self._schema.prompt}
         )
-        cypher_query = extract_cypher(cypher_query)
+        return self._postprocess_cypher(cypher_query)
+
+    async def _generate_cypher_query_streaming(
+        self,
+        question: str,
+        deadline: Optional[float] = None,
+        warmup_tasks: Optional[Set[asyncio.Task]] = None,
+    ) -> Tuple[str, Dict[str, asyncio.Task]]:
+        """Generate cypher while speculatively linking entities
+
+        Every time a `{prop: "literal"}` map is closed in the partial output,
+        the literal is sent to the vector store in the background. When the map
+        belongs to a labelled node pattern, the neighbourhood of the linked
+        nodes is prefetched so the final query reads warm pages.
+
+        Args:
+            question (str): user's question
+            deadline (Optional[float]): request deadline for the linking calls
+            warmup_tasks (Optional[Set[asyncio.Task]]): collects the warm-up
+                tasks of the request so the caller can cancel them
+
+        Returns:
+            Tuple[str, Dict[str, asyncio.Task]]: cypher query and the linking
+                tasks keyed by entity
+        """
+        logger.info("Text2Cypher (streaming)")
+        linking_tasks: Dict[str, asyncio.Task] = {}
+        warmup_tasks = set() if warmup_tasks is None else warmup_tasks
+        generated = ""
+        try:
+            async for chunk in self._chain.astream(
+                {"question": question, "schema": self._schema.prompt}
+            ):
+                generated += chunk
+                node_maps = self._extract_node_maps_from_cypher(generated)
+                for entity in self._extract_entity_from_cypher(generated):
+                    if entity not in linking_tasks and self.vector_caller.available:
+                        logger.info(f"Speculative linking: {entity}")
+                        linking_tasks[entity] = asyncio.create_task(
+                            self._link_and_warm_up(
+                                entity, node_maps.get(entity), deadline, warmup_tasks
+                            )
+                        )
+        except BaseException:
+            self._cancel_tasks(linking_tasks.values())
+            raise
+
+        return self._postprocess_cypher(generated), linking_tasks
+
+    def _postprocess_cypher(self, generated: str) -> str:
+        cypher_query = extract_cypher(generated)
         cypher_query = self.cypher_query_corrector.correct_query(cypher_query)
         logger.info(f"Cypher code: {cypher_query}")
-
         return cypher_query
 
-    async def _map_entities(self, cypher_query: str):
+    async def _map_entities(
+        self,
+        cypher_query: str,
+        linking_tasks: Optional[Dict[str, asyncio.Task]] = None,
+        deadline: Optional[float] = None,
+    ):
         # Execute the Cypher query using the database
+        linking_tasks = linking_tasks or {}
         entity_map = []
         entities = self._extract_entity_from_cypher(cypher_query)
 
+        # The corrector may rewrite the streamed query, drop stale speculation
+        self._cancel_tasks(
+            task for entity, task in linking_tasks.items() if entity not in entities
+        )
+
         if not entities:
             logger.info("No entities to link")
-            return input
+            return [{"cypher": cypher_query, "score": 1.0}]
 
         for entity in entities:
-            results = self._map_entity(entity=entity)
+            if entity in linking_tasks:
+                results = await linking_tasks[entity]
+            else:
+                results = await self._amap_entity(entity, deadline)
             entity_map.append(
                 {
                     "question": entity,
@@ -148,6 +275,68 @@ class Text2Cypher(BaseStep):
         # entity = tokenize(entity)
         return self.vector_db.search(query=entity, search_type="similarity")
 
+    async def _amap_entity(
+        self, entity: str, deadline: Optional[float] = None
+    ) -> List[Document]:
+        return await self.vector_caller.call_blocking(
+            self._map_entity, entity, deadline=deadline
+        )
+
+    async def _link_and_warm_up(
+        self,
+        entity: str,
+        node_map: Optional[Tuple[str, str]],
+        deadline: Optional[float] = None,
+        warmup_tasks: Optional[Set[asyncio.Task]] = None,
+    ) -> List[Document]:
+        results = await self._amap_entity(entity, deadline)
+        if node_map and warmup_tasks is not None:
+            label, prop = node_map
+            task = self._warm_up_entity(
+                label, prop, [r.page_content for r in results], deadline
+            )
+            if task:
+                warmup_tasks.add(task)
+        return results
+
+    def _warm_up_entity(
+        self,
+        label: str,
+        prop: str,
+        names: List[str],
+        deadline: Optional[float] = None,
+    ) -> Optional[asyncio.Task]:
+        """Prefetch the neighbourhood of linked nodes in the background"""
+        node_props = self._schema.structured.get("node_props", {})
+        known_props = [p["property"] for p in node_props.get(label, [])]
+        if not names or prop not in known_props:
+            return None
+        # best effort only, never queue behind or hammer a struggling graph
+        if not self.graph_caller.available or self.graph_caller.saturated:
+            return None
+
+        query = (
+            f"MATCH (n:`{label}`) WHERE n.`{prop}` IN $names "
+            "OPTIONAL MATCH (n)-[r]-(m) RETURN count(m)"
+        )
+        task = asyncio.create_task(
+            self.graph_caller.call_blocking(
+                self.graph_db.query, query, {"names": names}, deadline=deadline
+            )
+        )
+        task.add_done_callback(self._on_warm_up_done)
+        return task
+
+    @staticmethod
+    def _on_warm_up_done(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception():
+            logger.warning(f"Graph warm-up failed because of {task.exception()}")
+
+    @staticmethod
+    def _cancel_tasks(tasks) -> None:
+        for task in tasks:
+            task.cancel()
+
     def _extract_entity_from_cypher(self, cypher: str) -> List[str]:
         pattern = r"{\w+:\s*\"([^\"]+)\"}"
         cypher = cypher.replace("'", "\"")
@@ -155,6 +344,15 @@ class Text2Cypher(BaseStep):
         matches = list(set(matches))
         return matches
 
+    def _extract_node_maps_from_cypher(self, cypher: str) -> Dict[str, Tuple[str, str]]:
+        # (n:Label {prop: "literal"}) -> {literal: (Label, prop)}
+        pattern = r"\(\s*\w*\s*:\s*`?(\w+)`?\s*{(\w+):\s*\"([^\"]+)\"}"
+        cypher = cypher.replace("'", "\"")
+        return {
+            literal: (label, prop)
+            for label, prop, literal in re.findall(pattern, cypher)
+        }
+
     def _synthetic_cypher_query(self, raw_cypher: str, entity_map: list) -> list:
         cypher_variations = []
 
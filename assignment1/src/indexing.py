@@ -2,15 +2,11 @@ import dotenv
 from langchain_openai import AzureOpenAIEmbeddings
 from langchain_milvus import Milvus
 from langchain_neo4j import Neo4jGraph
-from src.configs import settings
+from src.configs import ENTITY_NAMES_CYPHER, settings
 from langchain_core.documents import Document
 
 dotenv.load_dotenv(override=True)
 
-cypher = """MATCH (n)
-WHERE n:Route OR n:Stop
-RETURN DISTINCT n.name AS name"""
-
 embeddings = AzureOpenAIEmbeddings(
     azure_deployment=settings.EMBEDDING_DEPLOYMENT_NAME,
     model=settings.EMBEDDING_MODEL_NAME,
@@ -35,7 +31,7 @@ milvus = Milvus(
     collection_name=settings.MILVUS_COLLECTION_NAME,
 )
 
-result = neo4j.query(cypher)
+result = neo4j.query(ENTITY_NAMES_CYPHER)
 node_names = [record["name"] for record in result if record["name"]]
 # node_names = [tokenize(name) for name in node_names]
 milvus.add_documents([Document(page_content=name) for name in node_names])
\ No newline at end of file
@@ -1,10 +1,14 @@
+import json
+import threading
+import time
 from typing import List
 
 import gradio as gr
 from gradio import ChatMessage
 
 from src.configs import settings
-from src.workflow import compiled_graph
+from src.syncs import FixtureSync
+from src.workflow import compiled_graph, milvus, neo4j, text2cypher
 
 
 async def generate_answer(message: str, history: List) -> str:
@@ -18,7 +22,12 @@ async def generate_answer(message: str, history: List) -> str:
         str: generated answer
     """
 
-    state = await compiled_graph.ainvoke({"question": message})
+    state = await compiled_graph.ainvoke(
+        {
+            "question": message,
+            "deadline": time.monotonic() + settings.REQUEST_TIMEOUT,
+        }
+    )
     return state["answer"]
 
 
@@ -37,11 +46,39 @@ async def response(message: str, history: List[ChatMessage]):
     yield history
 
 
+def load_fixtures(since: int) -> dict:
+    """Load the latest API-Sports fixtures payload
+
+    Args:
+        since (int): sync watermark. The file is written by an external
+            fetcher which owns the request window, so it is read as a whole
+
+    Returns:
+        dict: fixtures response
+    """
+    with open(settings.FIXTURE_PATH, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def run_fixture_sync() -> None:
+    """Create the fixture sync and poll the fixtures payload forever"""
+    fixture_sync = FixtureSync(
+        graph_db=neo4j,
+        vector_db=milvus,
+        state_path=settings.FIXTURE_SYNC_STATE_PATH,
+        listeners=[text2cypher.invalidate_cache],
+    )
+    fixture_sync.run_forever(load_fixtures, settings.FIXTURE_SYNC_INTERVAL)
+
+
 demo = gr.ChatInterface(
     response,
     title="FEBMS Chatbot",
     type="messages",
 )
 
+
 if __name__ == "__main__":
+    if settings.FIXTURE_SYNC_INTERVAL > 0:
+        threading.Thread(target=run_fixture_sync, daemon=True).start()
     demo.launch(server_name="0.0.0.0", server_port=settings.APPLICATION_API_PORT)
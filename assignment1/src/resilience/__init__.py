@@ -0,0 +1,13 @@
+from .policies import (BlockingExecutor, CircuitBreaker, CircuitOpenError,
+                       DeadlineExceededError, LatencyTracker, ResilientCaller,
+                       is_transient_error)
+
+__all__ = [
+    "BlockingExecutor",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DeadlineExceededError",
+    "LatencyTracker",
+    "ResilientCaller",
+    "is_transient_error",
+]
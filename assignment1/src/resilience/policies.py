@@ -0,0 +1,368 @@
+import asyncio
+import functools
+import importlib
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Deque, List, Optional, Tuple, TypeVar
+
+from src.loggers import logger
+
+T = TypeVar("T")
+
+
+def _optional_errors(module: str, names: List[str]) -> Tuple[type, ...]:
+    try:
+        imported = importlib.import_module(module)
+    except ImportError:
+        return ()
+    return tuple(getattr(imported, name) for name in names if hasattr(imported, name))
+
+
+# errors of a backend that is slow, overloaded or unreachable
+TRANSIENT_ERRORS: Tuple[type, ...] = (
+    TimeoutError,
+    ConnectionError,
+    *_optional_errors(
+        "neo4j.exceptions", ["ServiceUnavailable", "SessionExpired", "TransientError"]
+    ),
+    *_optional_errors("pymilvus.exceptions", ["MilvusUnavailableException"]),
+    *_optional_errors(
+        "google.api_core.exceptions",
+        [
+            "DeadlineExceeded",
+            "InternalServerError",
+            "ServiceUnavailable",
+            "TooManyRequests",
+        ],
+    ),
+    *_optional_errors(
+        "openai",
+        [
+            "APIConnectionError",
+            "APITimeoutError",
+            "InternalServerError",
+            "RateLimitError",
+        ],
+    ),
+)
+
+try:
+    import grpc
+
+    TRANSIENT_GRPC_CODES = {
+        grpc.StatusCode.UNAVAILABLE,
+        grpc.StatusCode.DEADLINE_EXCEEDED,
+        grpc.StatusCode.RESOURCE_EXHAUSTED,
+    }
+except ImportError:
+    grpc = None
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected by an open circuit breaker"""
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when the request deadline leaves no time for a call"""
+
+
+def is_transient_error(err: BaseException) -> bool:
+    """
+    Args:
+        err (BaseException): error raised by a call
+
+    Returns:
+        bool: whether the call is worth retrying and counts against the breaker
+    """
+    if isinstance(err, (CircuitOpenError, DeadlineExceededError)):
+        return False
+    if grpc is not None and isinstance(err, grpc.RpcError):
+        return err.code() in TRANSIENT_GRPC_CODES
+    return isinstance(err, TRANSIENT_ERRORS)
+
+
+class BlockingExecutor:
+    """
+    Dedicated thread pool for the blocking calls of one backend. Cancelled
+    calls keep their thread until the client returns, so stuck calls only
+    exhaust this pool instead of the default executor.
+    """
+
+    def __init__(self, name: str, max_workers: int = 8):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix=name)
+        self._running = 0
+        self._lock = threading.Lock()
+
+    @property
+    def saturated(self) -> bool:
+        return self._running >= self.max_workers
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, functools.partial(self._track, func, *args, **kwargs)
+        )
+
+    def _track(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing backend for a while, then let a single probe
+    through (half-open) to check whether it has recovered.
+    """
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        if self._opened_at is None:
+            return False
+        return time.monotonic() - self._opened_at < self.reset_timeout
+
+    def allow(self) -> bool:
+        """
+        Returns:
+            bool: whether a call may go through
+        """
+        if self._opened_at is None:
+            return True
+        if self.is_open:
+            return False
+        # half-open: restart the timer so only this probe goes through
+        self._opened_at = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            logger.warning(f"Circuit breaker {self.name} is open")
+            self._opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies"""
+
+    def __init__(self, window: int = 100):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def percentile(self, q: float) -> float:
+        """
+        Args:
+            q (float): percentile in range [0, 100]
+
+        Returns:
+            float: latency at the given percentile
+        """
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class ResilientCaller:
+    """
+    Run an async call under a per-stage timeout bounded by the request
+    deadline, with jittered retries, hedging and an optional circuit breaker.
+    With the defaults the call is made exactly once, without any limit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: Optional[float] = None,
+        retries: int = 0,
+        backoff: float = 0.5,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: int = 20,
+        breaker: Optional[CircuitBreaker] = None,
+        executor: Optional[BlockingExecutor] = None,
+        retry_on: Callable[[BaseException], bool] = is_transient_error,
+    ):
+        """
+        Args:
+            name (str): stage name used in logs
+            timeout (Optional[float]): timeout of a single attempt in seconds
+            retries (int): number of retries after the first attempt
+            backoff (float): base of the exponential backoff in seconds
+            hedge_percentile (Optional[float]): send a duplicate request once the
+                first one is slower than this latency percentile
+            hedge_min_samples (int): latency samples needed before hedging
+            breaker (Optional[CircuitBreaker]): breaker shared by the backend
+            executor (Optional[BlockingExecutor]): pool for `call_blocking`,
+                hedging stops while it is saturated
+            retry_on (Callable[[BaseException], bool]): errors which are
+                retried and counted by the breaker, others are raised at once
+        """
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = breaker
+        self.executor = executor
+        self.retry_on = retry_on
+        self.latency = LatencyTracker()
+
+    @property
+    def available(self) -> bool:
+        return self.breaker is None or not self.breaker.is_open
+
+    async def call(
+        self,
+        func: Callable[[], Awaitable[T]],
+        deadline: Optional[float] = None,
+    ) -> T:
+        """Call `func` under the configured policies
+
+        Args:
+            func (Callable[[], Awaitable[T]]): factory of the awaitable to run,
+                called again for every retry and hedged request
+            deadline (Optional[float]): request deadline in `time.monotonic()`
+
+        Returns:
+            T: result of the first successful attempt
+        """
+        if self.breaker and not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit breaker {self.name} is open")
+
+        error: Exception = DeadlineExceededError(f"No time left for {self.name}")
+        backend_failed = False
+        for attempt in range(self.retries + 1):
+            timeout = self._attempt_timeout(deadline)
+            if timeout is not None and timeout <= 0:
+                break
+            capped = timeout is not None and (
+                self.timeout is None or timeout < self.timeout
+            )
+
+            try:
+                result = await asyncio.wait_for(self._hedged(func), timeout)
+                if self.breaker:
+                    self.breaker.record_success()
+                return result
+            except Exception as e:
+                error = e
+                logger.warning(
+                    f"{self.name} attempt {attempt + 1} failed because of {e!r}"
+                )
+                if not self.retry_on(e):
+                    # the backend answered, the request itself is wrong
+                    if self.breaker:
+                        self.breaker.record_success()
+                    raise
+                # a timeout cut short by the request deadline is not its fault
+                if not (capped and isinstance(e, TimeoutError)):
+                    backend_failed = True
+
+            if attempt < self.retries:
+                delay = random.uniform(0, self.backoff * 2**attempt)
+                left = self._remaining(deadline)
+                if left is not None and delay >= left:
+                    break
+                await asyncio.sleep(delay)
+
+        if self.breaker and backend_failed:
+            self.breaker.record_failure()
+        raise error
+
+    async def call_blocking(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        deadline: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Call a blocking client function in a worker thread under the policies
+
+        Args:
+            func (Callable[..., T]): blocking function
+            deadline (Optional[float]): request deadline in `time.monotonic()`
+
+        Returns:
+            T: result of the first successful attempt
+        """
+        if self.executor is None:
+            return await self.call(
+                lambda: asyncio.to_thread(func, *args, **kwargs), deadline=deadline
+            )
+        return await self.call(
+            lambda: self.executor.run(func, *args, **kwargs), deadline=deadline
+        )
+
+    async def _hedged(self, func: Callable[[], Awaitable[T]]) -> T:
+        start = time.monotonic()
+        tasks = {asyncio.ensure_future(func())}
+        try:
+            hedge_delay = self._hedge_delay()
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done and not self.saturated:
+                    logger.info(f"Hedging {self.name} after {hedge_delay:.2f}s")
+                    tasks.add(asyncio.ensure_future(func()))
+
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self.latency.record(time.monotonic() - start)
+                        return task.result()
+                if not pending:
+                    raise next(iter(done)).exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _hedge_delay(self) -> Optional[float]:
+        if self.hedge_percentile is None or len(self.latency) < self.hedge_min_samples:
+            return None
+        return self.latency.percentile(self.hedge_percentile)
+
+    @property
+    def saturated(self) -> bool:
+        return self.executor is not None and self.executor.saturated
+
+    def _attempt_timeout(self, deadline: Optional[float]) -> Optional[float]:
+        left = self._remaining(deadline)
+        if left is None:
+            return self.timeout
+        if self.timeout is None:
+            return left
+        return min(self.timeout, left)
+
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        if deadline is None:
+            return None
+        return deadline - time.monotonic()
@@ -1,14 +1,23 @@
+from typing import Optional
+
 from langchain_core.documents import Document
 from langchain_neo4j.graphs.graph_store import GraphStore
 
 from src.loggers import logger
+from src.resilience import ResilientCaller
 from src.schemas import BaseStep, GenerationFlowState
 
 
 class KnowledgeRetriever(BaseStep):
-    def __init__(self, graph_db: GraphStore, **kwargs: dict):
+    def __init__(
+        self,
+        graph_db: GraphStore,
+        graph_caller: Optional[ResilientCaller] = None,
+        **kwargs: dict,
+    ):
         super().__init__(**kwargs)
         self.graph_db = graph_db
+        self.graph_caller = graph_caller or ResilientCaller("knowledge_retriever")
 
     async def arun(self, state: GenerationFlowState) -> GenerationFlowState:
         logger.info("KnowledgeRetriever")
@@ -23,24 +32,33 @@ class KnowledgeRetriever(BaseStep):
             return state
 
         retrieved_contexts = []
-        try:
-            for doc in contexts:
-                _cypher_query = doc.metadata.get("cypher", "")
-                results = self.graph_db.query(query=_cypher_query)
-
-                graph_context = Document(
-                    page_content="",
-                    metadata={
-                        "cypher": _cypher_query,
-                        "graph_data": results,
-                    },
+        last_error = None
+        for doc in contexts:
+            _cypher_query = doc.metadata.get("cypher", "")
+            try:
+                results = await self.graph_caller.call_blocking(
+                    self.graph_db.query, _cypher_query, deadline=state.get("deadline")
                 )
+            except Exception as err:
+                # keep the other cypher variations if only some of them fail
+                logger.exception(f"Can not retrieve graph data because of {err}")
+                last_error = err
+                continue
+
+            graph_context = Document(
+                page_content="",
+                metadata={
+                    "cypher": _cypher_query,
+                    "graph_data": results,
+                },
+            )
 
-                retrieved_contexts.append(graph_context)
+            retrieved_contexts.append(graph_context)
 
-            state["contexts"] = retrieved_contexts
-        except Exception as err:
-            logger.exception(f"Can not retrieve graph data because of {err}")
-            _errors.append(err)
+        if not retrieved_contexts and last_error is not None:
+            _errors.append(last_error)
             state["errors"] = _errors
+            return state
+
+        state["contexts"] = retrieved_contexts
         return state
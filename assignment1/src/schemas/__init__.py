@@ -1,9 +1,10 @@
 from langchain_neo4j.graphs.graph_document import Node, Relationship
 
-from .items import GraphSchema
+from .items import Fixture, GraphSchema
 from .state import BaseState, BaseStep, GenerationFlowState
 
 __all__ = [
+    "Fixture",
     "GraphSchema",
     "Node",
     "Relationship",
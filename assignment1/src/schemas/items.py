@@ -1,4 +1,5 @@
-from typing import List, Tuple
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
 
 from langchain_neo4j.graphs.graph_document import Relationship
 from pydantic import BaseModel
@@ -51,3 +52,75 @@ class GraphSchema(BaseModel):
                 return True
 
         return False
+
+
+class Fixture(BaseModel):
+    """
+    Match extracted from an item of the API-Sports `fixtures` response
+    """
+
+    fixture_id: int
+    timestamp: int
+    date: str
+    status: Optional[str] = None
+    referee: Optional[str] = None
+    venue_name: Optional[str] = None
+    venue_city: Optional[str] = None
+    league_id: Optional[int] = None
+    league_name: Optional[str] = None
+    season: Optional[int] = None
+    round: Optional[str] = None
+    home_team_id: int
+    home_team: str
+    away_team_id: int
+    away_team: str
+    home_goals: Optional[int] = None
+    away_goals: Optional[int] = None
+
+    @classmethod
+    def from_api(cls, item: Dict[str, Any]) -> "Fixture":
+        """
+        Args:
+            item (Dict[str, Any]): element of `response` in the API payload
+
+        Returns:
+            Fixture: parsed fixture
+        """
+        fixture = item.get("fixture", {})
+        venue = fixture.get("venue") or {}
+        league = item.get("league", {})
+        teams = item.get("teams", {})
+        goals = item.get("goals") or {}
+
+        return cls(
+            fixture_id=fixture["id"],
+            timestamp=fixture["timestamp"],
+            date=fixture["date"],
+            status=(fixture.get("status") or {}).get("short"),
+            referee=fixture.get("referee"),
+            venue_name=venue.get("name"),
+            venue_city=venue.get("city"),
+            league_id=league.get("id"),
+            league_name=league.get("name"),
+            season=league.get("season"),
+            round=league.get("round"),
+            home_team_id=teams["home"]["id"],
+            home_team=teams["home"]["name"],
+            away_team_id=teams["away"]["id"],
+            away_team=teams["away"]["name"],
+            home_goals=goals.get("home"),
+            away_goals=goals.get("away"),
+        )
+
+    @property
+    def score(self) -> Optional[str]:
+        if self.home_goals is None or self.away_goals is None:
+            return None
+        return f"{self.home_goals} - {self.away_goals}"
+
+    def fingerprint(self) -> str:
+        """
+        Returns:
+            str: hash of the fields, used to detect changed fixtures
+        """
+        return hashlib.sha1(self.model_dump_json().encode("utf-8")).hexdigest()
@@ -16,6 +16,7 @@ class GenerationFlowState(BaseState):
     answer: AnyStr
     contexts: List[Document]
     metadata: Dict
+    deadline: float
 
 
 class BaseStep(ABC):
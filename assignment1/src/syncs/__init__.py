@@ -0,0 +1,3 @@
+from .fixture_sync import FixtureDelta, FixtureSync
+
+__all__ = ["FixtureDelta", "FixtureSync"]
@@ -0,0 +1,283 @@
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+from langchain_neo4j.graphs.graph_store import GraphStore
+from pydantic import BaseModel, ValidationError
+
+from src.configs import ENTITY_NAMES_CYPHER
+from src.loggers import logger
+from src.schemas import Fixture
+
+# prefix of ids created for matches and teams which only exist in API-Sports
+ID_PREFIX = "api-sports:"
+
+# API-Sports short status of fixtures which will not change anymore
+FINISHED_STATUSES = {"FT", "AET", "PEN", "AWD", "WO", "CANC", "ABD"}
+
+# API-Sports ids live in their own properties, they overlap with the ids of
+# the provider the graph was built from
+RESOLVE_TEAMS_CYPHER = """UNWIND $teams AS team
+OPTIONAL MATCH (t:Team)
+WHERE t.ApiSportsTeamID = team.api_id OR t.TeamName = team.name
+WITH team, t
+ORDER BY CASE WHEN t.ApiSportsTeamID = team.api_id THEN 0 ELSE 1 END
+WITH team, collect(t.TeamID) AS team_ids
+RETURN team.api_id AS api_id, head(team_ids) AS team_id"""
+
+UPSERT_TEAMS_CYPHER = """UNWIND $teams AS team
+MERGE (t:Team {TeamID: team.team_id})
+ON CREATE SET t.TeamName = team.name, t.TeamLeague = team.league
+SET t.ApiSportsTeamID = team.api_id"""
+
+UPSERT_FIXTURES_CYPHER = """UNWIND $rows AS row
+MERGE (m:Match {ApiSportsFixtureID: row.fixture_id})
+ON CREATE SET m.MatchID = row.match_id
+SET m.Date = row.date,
+    m.Score = row.score,
+    m.MatchHomeTeam = row.home_team_id,
+    m.MatchAwayTeam = row.away_team_id
+WITH m, row
+OPTIONAL MATCH (m)-[old:competesIn|officiatedBy|hostedBy]-()
+DELETE old
+WITH DISTINCT m, row
+MATCH (h:Team {TeamID: row.home_team_id}), (a:Team {TeamID: row.away_team_id})
+MERGE (h)-[:competesIn]->(m)
+MERGE (a)-[:competesIn]->(m)
+FOREACH (_ IN CASE WHEN row.referee IS NULL THEN [] ELSE [1] END |
+    MERGE (r:Referee {RefereeName: row.referee})
+    MERGE (m)-[:officiatedBy]->(r))
+FOREACH (_ IN CASE WHEN row.venue_name IS NULL THEN [] ELSE [1] END |
+    MERGE (s:Stadium {StadiumName: row.venue_name})
+    ON CREATE SET s.StadiumRegion = row.venue_city
+    MERGE (m)-[:hostedBy]->(s)
+    SET m.StadiumID = s.StadiumID)"""
+
+
+class FixtureDelta(BaseModel):
+    """New or changed fixtures and the entity names they introduce"""
+
+    fixtures: List[Fixture] = []
+    teams: List[str] = []
+    referees: List[str] = []
+    venues: List[str] = []
+    watermark: int = 0
+
+    @property
+    def entities(self) -> List[str]:
+        return self.teams + self.referees + self.venues
+
+    def is_empty(self) -> bool:
+        return not self.fixtures
+
+
+class FixtureSync:
+    """
+    Incrementally sync API-Sports `fixtures` payloads into the graph and the
+    entity collection of the vector store.
+
+    Every fixture of the payload is compared by fingerprint, and only the
+    changed ones are written to Neo4j. The watermark is the kickoff of the
+    first unfinished fixture; it is handed to the payload source to narrow
+    the request window, never used to skip a fixture. Only names that are not
+    indexed yet are added to Milvus. Listeners are called with the applied
+    delta, e.g. to invalidate caches which depend on the graph.
+    """
+
+    def __init__(
+        self,
+        graph_db: GraphStore,
+        vector_db: VectorStore,
+        state_path: str = "data/fixture_sync_state.json",
+        listeners: Optional[List[Callable[[FixtureDelta], Any]]] = None,
+    ):
+        self.graph_db = graph_db
+        self.vector_db = vector_db
+        self.state_path = state_path
+        self.listeners = listeners or []
+        self.state = self._load_state()
+
+    @property
+    def watermark(self) -> int:
+        return self.state["watermark"]
+
+    def sync(self, payload: Dict[str, Any]) -> FixtureDelta:
+        """Diff the payload against the synced state and apply the delta
+
+        Args:
+            payload (Dict[str, Any]): API-Sports `fixtures` response
+
+        Returns:
+            FixtureDelta: applied delta
+        """
+        delta = self.diff(payload)
+        if delta.is_empty():
+            logger.info("No fixture to sync")
+            if delta.watermark != self.watermark:
+                self._commit(delta)
+            return delta
+
+        self.apply(delta)
+        self._commit(delta)
+
+        for listener in self.listeners:
+            try:
+                listener(delta)
+            except Exception as err:
+                logger.exception(f"Can not notify fixture sync because of {err}")
+
+        return delta
+
+    def diff(self, payload: Dict[str, Any]) -> FixtureDelta:
+        """
+        Args:
+            payload (Dict[str, Any]): API-Sports `fixtures` response
+
+        Returns:
+            FixtureDelta: new or changed fixtures with their new entity names
+        """
+        watermark = self.state["watermark"]
+        fingerprints = self.state["fingerprints"]
+        known_names = set(self.state["entities"])
+
+        fixtures = []
+        for item in payload.get("response", []):
+            try:
+                fixtures.append(Fixture.from_api(item))
+            except (AttributeError, KeyError, TypeError, ValidationError) as err:
+                logger.warning(f"Skip malformed fixture because of {err!r}")
+
+        # finished fixtures are compared too: score corrections, FT -> AWD
+        changed = [
+            fixture
+            for fixture in fixtures
+            if fingerprints.get(str(fixture.fixture_id)) != fixture.fingerprint()
+        ]
+
+        def new_names(names: List[Optional[str]]) -> List[str]:
+            unique = [name for name in dict.fromkeys(names) if name]
+            return [name for name in unique if name not in known_names]
+
+        return FixtureDelta(
+            fixtures=changed,
+            teams=new_names(
+                [f.home_team for f in changed] + [f.away_team for f in changed]
+            ),
+            referees=new_names([f.referee for f in changed]),
+            venues=new_names([f.venue_name for f in changed]),
+            watermark=max(watermark, self._watermark(fixtures)),
+        )
+
+    def apply(self, delta: FixtureDelta) -> None:
+        """Write the delta to Neo4j and Milvus
+
+        Args:
+            delta (FixtureDelta): delta computed by `diff`
+        """
+        team_ids = self._resolve_teams(delta.fixtures)
+        rows = [
+            {
+                "fixture_id": fixture.fixture_id,
+                "match_id": f"{ID_PREFIX}{fixture.fixture_id}",
+                "date": fixture.date[:10],
+                "score": fixture.score,
+                "home_team_id": team_ids[fixture.home_team_id],
+                "away_team_id": team_ids[fixture.away_team_id],
+                "referee": fixture.referee,
+                "venue_name": fixture.venue_name,
+                "venue_city": fixture.venue_city,
+            }
+            for fixture in delta.fixtures
+        ]
+        self.graph_db.query(UPSERT_FIXTURES_CYPHER, params={"rows": rows})
+        logger.info(f"Synced {len(rows)} fixtures to graph")
+
+        if delta.entities:
+            self.vector_db.add_documents(
+                [Document(page_content=name) for name in delta.entities]
+            )
+            logger.info(f"Indexed new entities: {delta.entities}")
+
+    def run_forever(
+        self, load_payload: Callable[[int], Dict[str, Any]], interval: float
+    ) -> None:
+        """Poll a payload source and sync it every `interval` seconds
+
+        Args:
+            load_payload (Callable[[int], Dict[str, Any]]): payload source,
+                called with the watermark as the start of the request window
+            interval (float): seconds between two syncs
+        """
+        while True:
+            try:
+                self.sync(load_payload(self.watermark))
+            except Exception as err:
+                logger.exception(f"Can not sync fixtures because of {err}")
+            time.sleep(interval)
+
+    def _resolve_teams(self, fixtures: List[Fixture]) -> Dict[int, Any]:
+        """Map API-Sports team ids to graph TeamIDs, creating unknown teams
+
+        Args:
+            fixtures (List[Fixture]): fixtures to sync
+
+        Returns:
+            Dict[int, Any]: TeamID by API-Sports team id
+        """
+        teams = {}
+        for f in fixtures:
+            teams[f.home_team_id] = {"api_id": f.home_team_id, "name": f.home_team}
+            teams[f.away_team_id] = {"api_id": f.away_team_id, "name": f.away_team}
+            for team_id in (f.home_team_id, f.away_team_id):
+                teams[team_id]["league"] = f.league_name
+
+        result = self.graph_db.query(
+            RESOLVE_TEAMS_CYPHER, params={"teams": list(teams.values())}
+        )
+        team_ids = {record["api_id"]: record["team_id"] for record in result}
+        for api_id, team in teams.items():
+            team["team_id"] = team_ids.get(api_id) or f"{ID_PREFIX}{api_id}"
+
+        self.graph_db.query(
+            UPSERT_TEAMS_CYPHER, params={"teams": list(teams.values())}
+        )
+        return {api_id: team["team_id"] for api_id, team in teams.items()}
+
+    def _watermark(self, fixtures: List[Fixture]) -> int:
+        # everything kicked off before the first unfinished fixture is final
+        unfinished = [
+            f.timestamp for f in fixtures if f.status not in FINISHED_STATUSES
+        ]
+        if unfinished:
+            return min(unfinished)
+        return max((f.timestamp for f in fixtures), default=0)
+
+    def _commit(self, delta: FixtureDelta) -> None:
+        for fixture in delta.fixtures:
+            self.state["fingerprints"][str(fixture.fixture_id)] = (
+                fixture.fingerprint()
+            )
+        self.state["entities"].extend(delta.entities)
+        self.state["watermark"] = delta.watermark
+
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.state, file, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def _load_state(self) -> Dict[str, Any]:
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+
+        # first run: src/indexing.py indexes the names of the same query
+        result = self.graph_db.query(ENTITY_NAMES_CYPHER)
+        return {
+            "watermark": 0,
+            "fingerprints": {},
+            "entities": [record["name"] for record in result if record["name"]],
+        }
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import dotenv
 from langchain_google_genai import GoogleGenerativeAI
 from langchain_milvus import Milvus
@@ -6,6 +8,7 @@ from langchain_openai import AzureOpenAIEmbeddings
 from langgraph.graph import END, START, StateGraph
 from src.configs import settings
 from src.generators import AnswerGenerator, Text2Cypher
+from src.resilience import BlockingExecutor, CircuitBreaker, ResilientCaller
 from src.retrievers import KnowledgeRetriever
 from src.schemas import GenerationFlowState
 
@@ -17,6 +20,8 @@ llm = GoogleGenerativeAI(
     model="gemma-3-27b-it",
     temperature=0.0,
     max_tokens=8096,
+    timeout=settings.LLM_TIMEOUT,
+    max_retries=0,
 )
 
 embeddings = AzureOpenAIEmbeddings(
@@ -25,6 +30,8 @@ embeddings = AzureOpenAIEmbeddings(
     azure_endpoint=settings.EMBEDDING_AZURE_ENDPOINT,
     api_version=settings.EMBEDDING_API_VERSION,
     api_key=settings.EMBEDDING_AZURE_OPENAI_API_KEY,
+    timeout=settings.RETRIEVAL_TIMEOUT,
+    max_retries=0,
 )
 
 neo4j = Neo4jGraph(
@@ -33,6 +40,7 @@ neo4j = Neo4jGraph(
     password=settings.NEO4J_PWD,
     refresh_schema=True,
     enhanced_schema=True,
+    timeout=settings.RETRIEVAL_TIMEOUT,
 )
 
 milvus = Milvus(
@@ -41,13 +49,81 @@ milvus = Milvus(
     auto_id=True,
     connection_args={"uri": settings.MILVUS_URI, "token": settings.MILVUS_TOKEN},
     collection_name=settings.MILVUS_COLLECTION_NAME,
+    timeout=settings.RETRIEVAL_TIMEOUT,
 )
 
-# init tasks
-knowledge_retriever = KnowledgeRetriever(graph_db=neo4j)
-answer_generator = AnswerGenerator(llm=llm)
-text2cypher = Text2Cypher(llm=llm, graph_db=neo4j, vector_db=milvus)
+# init resilience policies, one breaker per backend
+def create_breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=settings.BREAKER_RESET_TIMEOUT,
+    )
+
+
+def create_caller(
+    name: str,
+    breaker: CircuitBreaker,
+    timeout: float,
+    retries: int,
+    executor: Optional[BlockingExecutor] = None,
+) -> ResilientCaller:
+    return ResilientCaller(
+        name,
+        timeout=timeout,
+        retries=retries,
+        backoff=settings.RETRY_BACKOFF,
+        hedge_percentile=settings.HEDGE_PERCENTILE,
+        breaker=breaker,
+        executor=executor,
+    )
+
 
+llm_breaker = create_breaker("llm")
+neo4j_breaker = create_breaker("neo4j")
+milvus_breaker = create_breaker("milvus")
+neo4j_executor = BlockingExecutor("neo4j", settings.BLOCKING_POOL_SIZE)
+milvus_executor = BlockingExecutor("milvus", settings.BLOCKING_POOL_SIZE)
+
+# init tasks
+knowledge_retriever = KnowledgeRetriever(
+    graph_db=neo4j,
+    graph_caller=create_caller(
+        "knowledge_retriever",
+        neo4j_breaker,
+        settings.RETRIEVAL_TIMEOUT,
+        settings.RETRIEVAL_RETRIES,
+        neo4j_executor,
+    ),
+)
+answer_generator = AnswerGenerator(
+    llm=llm,
+    llm_caller=create_caller(
+        "answer_generator", llm_breaker, settings.LLM_TIMEOUT, settings.LLM_RETRIES
+    ),
+)
+text2cypher = Text2Cypher(
+    llm=llm,
+    graph_db=neo4j,
+    vector_db=milvus,
+    streaming=settings.STREAMING_ENTITY_LINKING,
+    llm_caller=create_caller(
+        "text2cypher", llm_breaker, settings.LLM_TIMEOUT, settings.LLM_RETRIES
+    ),
+    vector_caller=create_caller(
+        "entity_linking",
+        milvus_breaker,
+        settings.RETRIEVAL_TIMEOUT,
+        settings.RETRIEVAL_RETRIES,
+        milvus_executor,
+    ),
+    graph_caller=ResilientCaller(
+        "graph_warm_up",
+        timeout=settings.RETRIEVAL_TIMEOUT,
+        breaker=neo4j_breaker,
+        executor=neo4j_executor,
+    ),
+)
 
 # define workflow
 graph = StateGraph(GenerationFlowState)